@@ -1,34 +1,51 @@
 import os
+import json
+import sys
 import time
+import atexit
+import functools
 import logging
 import threading
-import requests
-from flask import Flask, jsonify, request
+import orjson
+from flask import Flask, request
+from flask.json.provider import DefaultJSONProvider
+from gunicorn.app.base import BaseApplication
 from opentelemetry import trace
-from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace import SpanProcessor, TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
-from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+from opentelemetry.sdk.trace.sampling import ParentBasedTraceIdRatio
 from opentelemetry.instrumentation.flask import FlaskInstrumentor
-from opentelemetry.instrumentation.requests import RequestsInstrumentor
 from opentelemetry.sdk.resources import Resource
 import random
 
 # Configure logging
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
 
 # Get configuration from environment variables
 PORT = int(os.getenv("PORT", "8000"))
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "2"))  # gunicorn worker processes
+WEB_THREADS = int(os.getenv("WEB_THREADS", "8"))  # threads per worker
+OTEL_EXPORTER_OTLP_PROTOCOL = os.getenv("OTEL_EXPORTER_OTLP_PROTOCOL", "grpc")  # grpc or http/protobuf
 OTEL_EXPORTER_OTLP_ENDPOINT = os.getenv(
     "OTEL_EXPORTER_OTLP_ENDPOINT", 
-    "http://localhost:4318"
+    "http://localhost:4317" if OTEL_EXPORTER_OTLP_PROTOCOL == "grpc" else "http://localhost:4318"
 )
 SERVICE_NAME = os.getenv("SERVICE_NAME", "flask-app")
 AUTO_TRACE_ENABLED = os.getenv("AUTO_TRACE_ENABLED", "true").lower() == "true"
 AUTO_TRACE_INTERVAL = int(os.getenv("AUTO_TRACE_INTERVAL", "30"))  # seconds
+AUTO_TRACE_MAX_BACKOFF = 300  # seconds
+SIMULATE_LATENCY = os.getenv("SIMULATE_LATENCY", "true").lower() == "true"
+OTEL_SAMPLER_RATIO = float(os.getenv("OTEL_SAMPLER_RATIO", "1.0"))
+OTEL_PYTHON_FLASK_EXCLUDED_URLS = os.getenv("OTEL_PYTHON_FLASK_EXCLUDED_URLS", "/health$")
+OTEL_BSP_MAX_QUEUE_SIZE = int(os.getenv("OTEL_BSP_MAX_QUEUE_SIZE", "4096"))
+OTEL_BSP_SCHEDULE_DELAY = int(os.getenv("OTEL_BSP_SCHEDULE_DELAY", "1000"))  # milliseconds
+OTEL_BSP_MAX_EXPORT_BATCH_SIZE = int(os.getenv("OTEL_BSP_MAX_EXPORT_BATCH_SIZE", "512"))  # multiple of per-request span count
+OTEL_BSP_EXPORT_TIMEOUT = int(os.getenv("OTEL_BSP_EXPORT_TIMEOUT", "10000"))  # milliseconds, bounds force_flush only
+OTEL_EXPORTER_OTLP_TRACES_TIMEOUT = int(os.getenv("OTEL_EXPORTER_OTLP_TRACES_TIMEOUT", "10"))  # seconds per export attempt
 
 # Configure OpenTelemetry
 resource = Resource.create({
@@ -37,241 +54,456 @@ resource = Resource.create({
 })
 
 # Set up the tracer provider
-tracer_provider = TracerProvider(resource=resource)
+tracer_provider = TracerProvider(
+    resource=resource,
+    sampler=ParentBasedTraceIdRatio(OTEL_SAMPLER_RATIO)
+)
 trace.set_tracer_provider(tracer_provider)
 
-# Configure OTLP exporter
-otlp_exporter = OTLPSpanExporter(
-    endpoint=f"{OTEL_EXPORTER_OTLP_ENDPOINT}/v1/traces"
-)
 
-# Add span processor
-span_processor = BatchSpanProcessor(otlp_exporter)
-tracer_provider.add_span_processor(span_processor)
+# Resolve the exporter and validate the batch settings up front so a bad
+# configuration fails at startup; only exporter construction is deferred
+if OTEL_EXPORTER_OTLP_PROTOCOL == "grpc":
+    from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+elif OTEL_EXPORTER_OTLP_PROTOCOL == "http/protobuf":
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+else:
+    raise ValueError(
+        f"OTEL_EXPORTER_OTLP_PROTOCOL must be 'grpc' or 'http/protobuf', got {OTEL_EXPORTER_OTLP_PROTOCOL!r}"
+    )
+
+if OTEL_BSP_MAX_QUEUE_SIZE <= 0:
+    raise ValueError("OTEL_BSP_MAX_QUEUE_SIZE must be a positive integer")
+if OTEL_BSP_SCHEDULE_DELAY <= 0:
+    raise ValueError("OTEL_BSP_SCHEDULE_DELAY must be a positive integer")
+if OTEL_BSP_MAX_EXPORT_BATCH_SIZE <= 0:
+    raise ValueError("OTEL_BSP_MAX_EXPORT_BATCH_SIZE must be a positive integer")
+if OTEL_BSP_MAX_EXPORT_BATCH_SIZE > OTEL_BSP_MAX_QUEUE_SIZE:
+    raise ValueError("OTEL_BSP_MAX_EXPORT_BATCH_SIZE must be less than or equal to OTEL_BSP_MAX_QUEUE_SIZE")
+
+
+def _get_processor():
+    """Build the OTLP exporter and its batch span processor"""
+    # gRPC keeps a persistent HTTP/2 channel to the collector
+    if OTEL_EXPORTER_OTLP_PROTOCOL == "grpc":
+        otlp_exporter = OTLPSpanExporter(
+            endpoint=OTEL_EXPORTER_OTLP_ENDPOINT,
+            insecure=True,
+            timeout=OTEL_EXPORTER_OTLP_TRACES_TIMEOUT
+        )
+    else:
+        otlp_exporter = OTLPSpanExporter(
+            endpoint=f"{OTEL_EXPORTER_OTLP_ENDPOINT}/v1/traces",
+            timeout=OTEL_EXPORTER_OTLP_TRACES_TIMEOUT
+        )
+    
+    # Tuned for bursts of several spans per request
+    return BatchSpanProcessor(
+        otlp_exporter,
+        max_queue_size=OTEL_BSP_MAX_QUEUE_SIZE,
+        schedule_delay_millis=OTEL_BSP_SCHEDULE_DELAY,
+        max_export_batch_size=OTEL_BSP_MAX_EXPORT_BATCH_SIZE,
+        export_timeout_millis=OTEL_BSP_EXPORT_TIMEOUT,
+    )
+
+
+class LazyBatchSpanProcessor(SpanProcessor):
+    """Span processor that builds the real processor when the first span ends
+    
+    If building the processor fails the error is logged once and spans are
+    dropped, since on_end must not raise into the code ending the span.
+    """
+    
+    def __init__(self, factory):
+        self._factory = factory
+        self._processor = None
+        self._failed = False
+        self._shutdown = False
+        self._lock = threading.Lock()
+    
+    def _get(self):
+        if self._processor is None and not self._failed:
+            with self._lock:
+                if self._processor is None and not self._failed and not self._shutdown:
+                    try:
+                        self._processor = self._factory()
+                    except Exception:
+                        self._failed = True
+                        logger.exception("Failed to create span processor, spans will be dropped")
+        return self._processor
+    
+    def on_end(self, span):
+        if self._shutdown:
+            return
+        processor = self._get()
+        if processor is not None:
+            processor.on_end(span)
+    
+    def shutdown(self):
+        # Taking the lock keeps a span ending during teardown from
+        # starting a new processor
+        with self._lock:
+            self._shutdown = True
+        if self._processor is not None:
+            self._processor.shutdown()
+    
+    def force_flush(self, timeout_millis=30000):
+        if self._processor is None:
+            return True
+        return self._processor.force_flush(timeout_millis)
+
+
+# Add span processor; exporter setup is deferred until there is a span to export
+tracer_provider.add_span_processor(LazyBatchSpanProcessor(_get_processor))
 
 # Get tracer
 tracer = trace.get_tracer(__name__)
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that parses request bodies with orjson
+    
+    orjson decodes integers wider than 64 bits as floats, so very large
+    numbers in a request body lose precision. Responses are built by ojson().
+    """
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 # Create Flask app
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
-# Instrument Flask app
-FlaskInstrumentor().instrument_app(app)
-RequestsInstrumentor().instrument()
 
-logger.info(f"Starting {SERVICE_NAME} on port {PORT}")
-logger.info(f"OTLP endpoint: {OTEL_EXPORTER_OTLP_ENDPOINT}")
-logger.info(f"Auto trace enabled: {AUTO_TRACE_ENABLED}")
+def ojson(obj, status=200):
+    """Build a JSON response serialized with orjson"""
+    try:
+        body = orjson.dumps(obj)
+    except orjson.JSONEncodeError:
+        # orjson rejects input nested deeper than 254 levels, which clients
+        # can send to /api/process; the stdlib encoder still handles it
+        body = json.dumps(obj)
+    return app.response_class(body, status=status, mimetype='application/json')
+
+
+def traced(name, attrs):
+    """Run the wrapped handler inside a span carrying the given static attributes"""
+    _start = tracer.start_as_current_span
+    
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _start(name) as span:
+                if span.is_recording():
+                    span.set_attributes(attrs)
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+# Instrument Flask app; health probes are excluded so they don't produce traces
+FlaskInstrumentor().instrument_app(app, excluded_urls=OTEL_PYTHON_FLASK_EXCLUDED_URLS)
+
+# Interned span attribute keys and route values, shared by every span
+_K_ENDPOINT = sys.intern("endpoint")
+_K_METHOD = sys.intern("method")
+_K_PTIME = sys.intern("processing.time_seconds")
+_K_TTIME = sys.intern("transform.time_seconds")
+_K_INPUT_SIZE = sys.intern("input.size")
+_K_ERROR = sys.intern("error")
+_K_ERROR_INTENTIONAL = sys.intern("error.intentional")
+_K_OPERATION_NUMBER = sys.intern("operation.number")
+_K_VALUE = sys.intern("value")
+_K_AUTO_GENERATED = sys.intern("auto.generated")
+_K_TARGET_ENDPOINT = sys.intern("target.endpoint")
+_K_TARGET_METHOD = sys.intern("target.method")
+_K_STATUS_CODE = sys.intern("http.status_code")
+_V_POST = sys.intern("POST")
+_V_HOME = sys.intern("/")
+_V_DATA = sys.intern("/api/data")
+_V_PROCESS = sys.intern("/api/process")
+_V_ERROR = sys.intern("/api/error")
+_V_CHAIN = sys.intern("/api/chain")
+
+# Responses and span attributes for the static endpoints never change after
+# startup, so build them once instead of per request
+_HOME_BODY = orjson.dumps({
+    "message": "Welcome to Flask App",
+    "service": SERVICE_NAME,
+    "status": "running"
+})
+_HOME_RESP = app.response_class(_HOME_BODY, mimetype='application/json')
+_HOME_SPAN_ATTRS = {_K_ENDPOINT: _V_HOME}
+
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "service": SERVICE_NAME
+})
+_HEALTH_RESP = app.response_class(_HEALTH_BODY, status=200, mimetype='application/json')
+
+# In-process client used by the auto trace generator to call our own endpoints
+# without a socket round-trip
+_self_client = app.test_client()
+
+# Pre-encoded payload for auto-generated POSTs; only the value is filled in per call
+_POST_BODY = b'{"auto":true,"value":%d}'
+
+logger.info("Starting %s on port %s", SERVICE_NAME, PORT)
+logger.info("OTLP endpoint: %s (%s)", OTEL_EXPORTER_OTLP_ENDPOINT, OTEL_EXPORTER_OTLP_PROTOCOL)
+logger.info("Auto trace enabled: %s", AUTO_TRACE_ENABLED)
 if AUTO_TRACE_ENABLED:
-    logger.info(f"Auto trace interval: {AUTO_TRACE_INTERVAL} seconds")
+    logger.info("Auto trace interval: %s seconds", AUTO_TRACE_INTERVAL)
+
+# Dedicated PRNG so handlers don't share the module-level random instance
+_rng = random.Random()
+
+# Signals the auto trace generator to stop; set on interpreter exit
+_stop = threading.Event()
+atexit.register(_stop.set)
 
 
 def auto_trace_generator():
     """Background thread that automatically generates traces by calling endpoints"""
-    # Wait for Flask to start
-    time.sleep(5)
-    
-    base_url = f"http://localhost:{PORT}"
+    # Give the app a moment to finish starting up
+    if _stop.wait(5):
+        return
     
     # Define endpoints to call automatically
     endpoints = [
         {"method": "GET", "path": "/", "name": "home"},
-        {"method": "GET", "path": "/health", "name": "health"},
         {"method": "GET", "path": "/api/data", "name": "get_data"},
-        {"method": "POST", "path": "/api/process", "name": "process_data", "json": {"auto": True, "value": random.randint(1, 100)}},
+        {"method": "POST", "path": "/api/process", "name": "process_data"},
         {"method": "GET", "path": "/api/chain", "name": "chain_ops"},
     ]
     
     logger.info("Auto trace generator started")
     
+    failure_count = 0
+    choice = _rng.choice
+    rand_int = _rng.randint
+    
     while True:
         try:
             # Randomly select an endpoint to call
-            endpoint = random.choice(endpoints)
+            endpoint = choice(endpoints)
             
             with tracer.start_as_current_span("auto-trace-call") as span:
-                span.set_attribute("auto.generated", True)
-                span.set_attribute("target.endpoint", endpoint["path"])
-                span.set_attribute("target.method", endpoint["method"])
+                span.set_attributes({
+                    _K_AUTO_GENERATED: True,
+                    _K_TARGET_ENDPOINT: endpoint["path"],
+                    _K_TARGET_METHOD: endpoint["method"]
+                })
                 
-                logger.info(f"Auto-generating trace for {endpoint['method']} {endpoint['path']}")
+                logger.info("Auto-generating trace for %s %s", endpoint["method"], endpoint["path"])
                 
                 try:
                     if endpoint["method"] == "GET":
-                        response = requests.get(
-                            f"{base_url}{endpoint['path']}", 
-                            timeout=10
-                        )
+                        response = _self_client.get(endpoint["path"])
                     elif endpoint["method"] == "POST":
-                        response = requests.post(
-                            f"{base_url}{endpoint['path']}", 
-                            json=endpoint.get("json", {}),
-                            timeout=10
+                        response = _self_client.post(
+                            endpoint["path"],
+                            data=_POST_BODY % rand_int(1, 100),
+                            content_type="application/json"
                         )
                     
-                    span.set_attribute("http.status_code", response.status_code)
-                    logger.info(f"Auto trace completed: {endpoint['name']} - Status {response.status_code}")
+                    span.set_attribute(_K_STATUS_CODE, response.status_code)
+                    logger.info("Auto trace completed: %s - Status %s", endpoint["name"], response.status_code)
+                    # The test client turns handler errors into 500 responses
+                    # rather than raising, so back off on those as well
+                    if response.status_code >= 500:
+                        failure_count += 1
+                    else:
+                        failure_count = 0
                     
-                except requests.exceptions.RequestException as e:
+                except Exception as e:
                     span.record_exception(e)
-                    logger.error(f"Auto trace failed for {endpoint['path']}: {str(e)}")
-            
-            # Wait before next call
-            time.sleep(AUTO_TRACE_INTERVAL)
+                    logger.error("Auto trace failed for %s: %s", endpoint["path"], e)
+                    failure_count += 1
             
         except Exception as e:
-            logger.error(f"Error in auto trace generator: {str(e)}")
-            time.sleep(AUTO_TRACE_INTERVAL)
+            logger.error("Error in auto trace generator: %s", e)
+            failure_count += 1
+        
+        # Wait before next call, backing off exponentially after failures
+        delay = min(AUTO_TRACE_INTERVAL * (2 ** failure_count), AUTO_TRACE_MAX_BACKOFF)
+        if _stop.wait(delay):
+            return
 
 
 @app.route('/')
+@traced("home-handler", _HOME_SPAN_ATTRS)
 def home():
     """Root endpoint"""
     logger.info("Root endpoint called")
     
-    with tracer.start_as_current_span("home-handler") as span:
-        span.set_attribute("endpoint", "/")
-        span.set_attribute("method", request.method)
-        
-        return jsonify({
-            "message": "Welcome to Flask App",
-            "service": SERVICE_NAME,
-            "status": "running"
-        })
+    trace.get_current_span().set_attribute(_K_METHOD, request.method)
+    
+    return _HOME_RESP
 
 
 @app.route('/health')
 def health():
-    """Health check endpoint"""
+    """Health check endpoint, served without tracing"""
     logger.info("Health check endpoint called")
     
-    with tracer.start_as_current_span("health-check") as span:
-        span.set_attribute("endpoint", "/health")
-        span.set_attribute("health.status", "healthy")
-        
-        return jsonify({
-            "status": "healthy",
-            "service": SERVICE_NAME
-        }), 200
+    return _HEALTH_RESP
 
 
 @app.route('/api/data')
+@traced("get-data", {_K_ENDPOINT: _V_DATA})
 def get_data():
     """Simulated data endpoint with processing time"""
     logger.info("Data endpoint called")
     
-    with tracer.start_as_current_span("get-data") as span:
-        span.set_attribute("endpoint", "/api/data")
-        
-        # Simulate some processing
-        processing_time = random.uniform(0.1, 0.5)
+    rand_int = _rng.randint
+    rand_uni = _rng.uniform
+    now = time.time
+    
+    # Simulate some processing; report no time spent when not simulating
+    processing_time = 0.0
+    if SIMULATE_LATENCY:
+        processing_time = rand_uni(0.1, 0.5)
         time.sleep(processing_time)
-        
-        span.set_attribute("processing.time_seconds", processing_time)
-        
-        data = {
-            "id": random.randint(1, 1000),
-            "value": random.uniform(0, 100),
-            "timestamp": time.time()
-        }
-        
-        logger.info(f"Generated data: {data}")
-        
-        return jsonify(data)
+    
+    trace.get_current_span().set_attribute(_K_PTIME, processing_time)
+    
+    data = {
+        "id": rand_int(1, 1000),
+        "value": rand_uni(0, 100),
+        "timestamp": now()
+    }
+    
+    logger.info("Generated data id=%s value=%.3f", data["id"], data["value"])
+    
+    return ojson(data)
 
 
 @app.route('/api/process', methods=['POST'])
+@traced("process-data", {_K_ENDPOINT: _V_PROCESS, _K_METHOD: _V_POST})
 def process_data():
     """Simulated data processing endpoint"""
     logger.info("Process endpoint called")
     
-    with tracer.start_as_current_span("process-data") as span:
-        span.set_attribute("endpoint", "/api/process")
-        span.set_attribute("method", "POST")
-        
-        data = request.get_json() or {}
-        
-        # Simulate processing with nested span
-        with tracer.start_as_current_span("validate-input") as validate_span:
-            validate_span.set_attribute("input.size", len(str(data)))
-            logger.info(f"Validating input: {data}")
+    # Read the body once; the JSON parse below reuses these bytes and the
+    # parsed result is not cached since it is only used here
+    raw = request.get_data(cache=True)
+    data = request.get_json(cache=False, silent=True) or {}
+    
+    # Simulate processing with nested span
+    with tracer.start_as_current_span("validate-input") as validate_span:
+        validate_span.set_attribute(_K_INPUT_SIZE, len(raw))
+        logger.debug("Validating input: %s", data)
+        if SIMULATE_LATENCY:
             time.sleep(0.1)
-        
-        with tracer.start_as_current_span("transform-data") as transform_span:
-            # Simulate transformation
-            processing_time = random.uniform(0.2, 0.7)
+    
+    with tracer.start_as_current_span("transform-data") as transform_span:
+        # Simulate transformation
+        processing_time = 0.0
+        if SIMULATE_LATENCY:
+            processing_time = _rng.uniform(0.2, 0.7)
             time.sleep(processing_time)
-            transform_span.set_attribute("transform.time_seconds", processing_time)
-            
-            result = {
-                "processed": True,
-                "input": data,
-                "result": random.randint(100, 999),
-                "processing_time": processing_time
-            }
-            
-            logger.info(f"Processing completed: {result}")
+        transform_span.set_attribute(_K_TTIME, processing_time)
+        
+        result = {
+            "processed": True,
+            "input": data,
+            "result": _rng.randint(100, 999),
+            "processing_time": processing_time
+        }
         
-        return jsonify(result)
+        logger.info("Processing completed: %s", result)
+    
+    return ojson(result)
 
 
 @app.route('/api/error')
+@traced("error-handler", {_K_ENDPOINT: _V_ERROR, _K_ERROR_INTENTIONAL: True})
 def trigger_error():
     """Endpoint that triggers an error for testing"""
     logger.error("Error endpoint called - triggering error")
     
-    with tracer.start_as_current_span("error-handler") as span:
-        span.set_attribute("endpoint", "/api/error")
-        span.set_attribute("error.intentional", True)
+    span = trace.get_current_span()
+    
+    # Record exception in span
+    try:
+        raise Exception("Intentional error for testing")
+    except Exception as e:
+        span.record_exception(e)
+        span.set_attribute(_K_ERROR, True)
+        logger.exception("Exception occurred")
         
-        # Record exception in span
-        try:
-            raise Exception("Intentional error for testing")
-        except Exception as e:
-            span.record_exception(e)
-            span.set_attribute("error", True)
-            logger.exception("Exception occurred")
-            
-            return jsonify({
-                "error": str(e),
-                "message": "This is an intentional error for testing"
-            }), 500
+        return ojson({
+            "error": str(e),
+            "message": "This is an intentional error for testing"
+        }, 500)
 
 
 @app.route('/api/chain')
+@traced("chain-operations", {_K_ENDPOINT: _V_CHAIN})
 def chain_operations():
     """Endpoint with multiple nested operations"""
     logger.info("Chain operations endpoint called")
     
-    with tracer.start_as_current_span("chain-operations") as span:
-        span.set_attribute("endpoint", "/api/chain")
+    span = trace.get_current_span()
+    rand_int = _rng.randint
+    rand_uni = _rng.uniform
+    results = []
+    
+    # Record each step as an event on the handler span rather than a child span
+    for i in range(3):
+        if SIMULATE_LATENCY:
+            time.sleep(rand_uni(0.05, 0.15))
         
-        results = []
+        result = {
+            "step": i+1,
+            "value": rand_int(1, 100)
+        }
+        results.append(result)
         
-        for i in range(3):
-            with tracer.start_as_current_span(f"operation-{i+1}") as op_span:
-                op_span.set_attribute("operation.number", i+1)
-                time.sleep(random.uniform(0.05, 0.15))
-                
-                result = {
-                    "step": i+1,
-                    "value": random.randint(1, 100)
-                }
-                results.append(result)
-                
-                logger.info(f"Operation {i+1} completed: {result}")
+        if span.is_recording():
+            span.add_event(f"operation-{i+1}", {_K_OPERATION_NUMBER: i+1, _K_VALUE: result["value"]})
         
-        return jsonify({
-            "operations": results,
-            "total_steps": len(results)
-        })
+        logger.info("Operation %s completed: %s", i+1, result)
+    
+    return ojson({
+        "operations": results,
+        "total_steps": len(results)
+    })
 
 
-if __name__ == '__main__':
-    # Start auto trace generator in background thread if enabled
+class StandaloneApplication(BaseApplication):
+    """Run the Flask app under gunicorn from within this module"""
+    
+    def __init__(self, application, options=None):
+        self.application = application
+        self.options = options or {}
+        super().__init__()
+    
+    def load_config(self):
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key.lower(), value)
+    
+    def load(self):
+        return self.application
+
+
+def start_auto_trace(server):
+    """Start auto trace generator in background thread if enabled"""
     if AUTO_TRACE_ENABLED:
         trace_thread = threading.Thread(target=auto_trace_generator, daemon=True)
         trace_thread.start()
         logger.info("Auto trace generator thread started")
-    
-    app.run(host='0.0.0.0', port=PORT, debug=False)
+
+
+if __name__ == '__main__':
+    StandaloneApplication(app, {
+        'bind': f'0.0.0.0:{PORT}',
+        'workers': WEB_CONCURRENCY,
+        'worker_class': 'gthread',
+        'threads': WEB_THREADS,
+        # Runs once in the gunicorn master, so synthetic traffic isn't
+        # multiplied by the number of workers
+        'when_ready': start_auto_trace,
+    }).run()